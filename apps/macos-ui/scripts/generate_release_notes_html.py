@@ -5,14 +5,123 @@ from __future__ import annotations
 
 import argparse
 import datetime as dt
+import functools
+import hashlib
 import html
+import os
 import pathlib
 import re
+import shutil
+import stat
 import sys
-from typing import Iterable, List
+import tempfile
+from typing import Iterable, Iterator, List
 
 
 HEADING_RE = re.compile(r"^## \[(?P<version>[^\]]+)\] - (?P<date>\d{4}-\d{2}-\d{2})\s*$")
+HTML_ESCAPE_TABLE = str.maketrans(
+    {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#x27;"}
+)
+CACHE_DIR = pathlib.Path(tempfile.gettempdir()) / "helm-relnotes-cache"
+
+PAGE_HEAD_OPEN = """<!doctype html>
+<html lang="en">
+<head>
+  <meta charset="utf-8">
+  <meta name="viewport" content="width=device-width, initial-scale=1">
+"""
+
+PAGE_STYLE = """  <style>
+    :root {
+      color-scheme: light dark;
+    }
+    body {
+      margin: 0;
+      font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Inter, sans-serif;
+      line-height: 1.55;
+      background: #f7f8fa;
+      color: #111827;
+    }
+    main {
+      max-width: 860px;
+      margin: 0 auto;
+      padding: 24px;
+    }
+    article {
+      background: #ffffff;
+      border: 1px solid #e5e7eb;
+      border-radius: 12px;
+      padding: 24px;
+    }
+    h1 {
+      margin: 0 0 4px;
+      font-size: 1.6rem;
+      line-height: 1.3;
+    }
+    h2 {
+      margin: 24px 0 8px;
+      font-size: 1.1rem;
+    }
+    p, ul {
+      margin: 8px 0;
+    }
+    ul {
+      padding-left: 20px;
+    }
+    .meta {
+      color: #4b5563;
+      font-size: 0.95rem;
+      margin: 0 0 12px;
+    }
+    code {
+      font-family: ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, monospace;
+      background: #f3f4f6;
+      border-radius: 6px;
+      padding: 0.1rem 0.35rem;
+      font-size: 0.92em;
+    }
+    footer {
+      margin-top: 16px;
+      color: #6b7280;
+      font-size: 0.9rem;
+    }
+    @media (prefers-color-scheme: dark) {
+      body {
+        background: #0b1220;
+        color: #e5e7eb;
+      }
+      article {
+        background: #0f172a;
+        border-color: #1f2937;
+      }
+      .meta {
+        color: #9ca3af;
+      }
+      code {
+        background: #111827;
+      }
+      footer {
+        color: #9ca3af;
+      }
+      a {
+        color: #93c5fd;
+      }
+    }
+  </style>
+</head>
+"""
+
+PAGE_BODY_OPEN = """<body>
+  <main>
+    <article>
+"""
+
+PAGE_TAIL = """    </article>
+    <footer>Generated from <code>CHANGELOG.md</code>.</footer>
+  </main>
+</body>
+</html>
+"""
 
 
 def parse_args() -> argparse.Namespace:
@@ -26,23 +135,34 @@ def parse_args() -> argparse.Namespace:
     )
     parser.add_argument(
         "--tag",
+        dest="tags",
+        action="append",
         required=True,
-        help="Release tag (for example: v0.17.0-rc.3)",
+        help="Release tag (for example: v0.17.0-rc.3); repeat to render several pages",
     )
     parser.add_argument(
         "--output-path",
         required=True,
-        help="Output HTML file path",
+        help="Output HTML file path; must contain {tag} when more than one --tag is given",
     )
     parser.add_argument(
         "--canonical-url",
         default="",
-        help="Optional canonical URL for the generated page",
+        help="Optional canonical URL for the generated page ({tag} is substituted)",
     )
     parser.add_argument(
         "--fallback-release-url",
         default="",
-        help="Optional fallback URL to include in the page footer",
+        help="Optional fallback URL to include in the page footer ({tag} is substituted)",
+    )
+    parser.add_argument(
+        "--clean-cache",
+        action="store_true",
+        help=(
+            "Discard cached pages before generating. Pages from older versions of this "
+            "script are pruned automatically, but entries for earlier changelog contents "
+            "or URLs accumulate until this flag is used"
+        ),
     )
     return parser.parse_args()
 
@@ -55,10 +175,12 @@ def normalize_version(tag: str) -> str:
 
 def render_inline(text: str) -> str:
     """Render inline code spans and escape all other HTML-sensitive characters."""
+    if "`" not in text:
+        return text.translate(HTML_ESCAPE_TABLE)
     parts = text.split("`")
     rendered: List[str] = []
     for index, part in enumerate(parts):
-        escaped = html.escape(part, quote=True)
+        escaped = part.translate(HTML_ESCAPE_TABLE)
         if index % 2 == 1:
             rendered.append(f"<code>{escaped}</code>")
         else:
@@ -66,49 +188,51 @@ def render_inline(text: str) -> str:
     return "".join(rendered)
 
 
-def extract_section(changelog_text: str, version: str) -> tuple[str, List[str]]:
-    lines = changelog_text.splitlines()
-    start_index = -1
-    release_date = ""
+def find_heading_start(changelog_text: str, pos: int) -> int:
+    """Return the offset of the next line starting with ``## [`` after ``pos``, or -1."""
+    index = changelog_text.find("\n## [", pos)
+    return index + 1 if index != -1 else -1
 
-    for idx, line in enumerate(lines):
-        match = HEADING_RE.match(line.strip())
-        if match and match.group("version") == version:
-            start_index = idx + 1
-            release_date = match.group("date")
-            break
 
-    if start_index == -1:
-        raise ValueError(f"Could not find release section for version '{version}' in changelog.")
+def extract_section(changelog_text: str, version: str) -> tuple[str, List[str]]:
+    """Return the release date and body lines for ``version``."""
+    text_length = len(changelog_text)
+    line_start = 0 if changelog_text.startswith("## [") else find_heading_start(changelog_text, 0)
 
-    end_index = len(lines)
-    for idx in range(start_index, len(lines)):
-        if lines[idx].startswith("## ["):
-            end_index = idx
-            break
+    while line_start != -1:
+        line_end = changelog_text.find("\n", line_start)
+        if line_end == -1:
+            line_end = text_length
+        next_start = find_heading_start(changelog_text, line_end)
 
-    section_lines = lines[start_index:end_index]
-    while section_lines and section_lines[0].strip() == "":
-        section_lines.pop(0)
-    while section_lines and section_lines[-1].strip() == "":
-        section_lines.pop()
+        match = HEADING_RE.match(changelog_text[line_start:line_end])
+        if match and match.group("version") == version:
+            section_end = next_start if next_start != -1 else text_length
+            section_lines = changelog_text[line_end + 1 : section_end].splitlines()
+            while section_lines and section_lines[0].strip() == "":
+                section_lines.pop(0)
+            while section_lines and section_lines[-1].strip() == "":
+                section_lines.pop()
+            return match.group("date"), section_lines
 
-    return release_date, section_lines
+        line_start = next_start
+
+    raise ValueError(f"Could not find release section for version '{version}' in changelog.")
 
 
 def render_section_body(lines: Iterable[str]) -> str:
     blocks: List[str] = []
+    append = blocks.append
     list_open = False
 
     def close_list() -> None:
         nonlocal list_open
         if list_open:
-            blocks.append("    </ul>")
+            append("    </ul>")
             list_open = False
 
     for raw_line in lines:
-        line = raw_line.rstrip()
-        stripped = line.strip()
+        stripped = raw_line.strip()
 
         if stripped == "":
             close_list()
@@ -117,24 +241,24 @@ def render_section_body(lines: Iterable[str]) -> str:
         if stripped.startswith("### "):
             close_list()
             heading = render_inline(stripped[4:].strip())
-            blocks.append(f"    <h2>{heading}</h2>")
+            append(f"    <h2>{heading}</h2>")
             continue
 
-        bullet_match = re.match(r"^\s*-\s+(.*)$", line)
-        if bullet_match:
+        if stripped.startswith("-") and stripped[1:2].isspace():
             if not list_open:
-                blocks.append("    <ul>")
+                append("    <ul>")
                 list_open = True
-            blocks.append(f"      <li>{render_inline(bullet_match.group(1).strip())}</li>")
+            append(f"      <li>{render_inline(stripped[1:].strip())}</li>")
             continue
 
         close_list()
-        blocks.append(f"    <p>{render_inline(stripped)}</p>")
+        append(f"    <p>{render_inline(stripped)}</p>")
 
     close_list()
     return "\n".join(blocks)
 
 
+@functools.lru_cache(maxsize=64)
 def format_release_date(raw_date: str) -> str:
     try:
         parsed = dt.date.fromisoformat(raw_date)
@@ -143,13 +267,14 @@ def format_release_date(raw_date: str) -> str:
     return f"{parsed.strftime('%B')} {parsed.day}, {parsed.year}"
 
 
-def build_html(
+def iter_html(
     version: str,
     release_date: str,
     body_html: str,
     canonical_url: str,
     fallback_release_url: str,
-) -> str:
+) -> Iterator[str]:
+    """Yield the release-notes page in chunks so callers can stream it to disk."""
     canonical_tag = (
         f'  <link rel="canonical" href="{html.escape(canonical_url, quote=True)}">\n'
         if canonical_url
@@ -163,137 +288,200 @@ def build_html(
             f'<a href="{safe_url}" rel="noopener noreferrer">View this release on GitHub</a>.</p>\n'
         )
 
+    safe_version = html.escape(version, quote=True)
     safe_date = html.escape(release_date, quote=True)
-    return f"""<!doctype html>
-<html lang="en">
-<head>
-  <meta charset="utf-8">
-  <meta name="viewport" content="width=device-width, initial-scale=1">
-  <title>Helm {html.escape(version, quote=True)} Release Notes</title>
-{canonical_tag}  <style>
-    :root {{
-      color-scheme: light dark;
-    }}
-    body {{
-      margin: 0;
-      font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Inter, sans-serif;
-      line-height: 1.55;
-      background: #f7f8fa;
-      color: #111827;
-    }}
-    main {{
-      max-width: 860px;
-      margin: 0 auto;
-      padding: 24px;
-    }}
-    article {{
-      background: #ffffff;
-      border: 1px solid #e5e7eb;
-      border-radius: 12px;
-      padding: 24px;
-    }}
-    h1 {{
-      margin: 0 0 4px;
-      font-size: 1.6rem;
-      line-height: 1.3;
-    }}
-    h2 {{
-      margin: 24px 0 8px;
-      font-size: 1.1rem;
-    }}
-    p, ul {{
-      margin: 8px 0;
-    }}
-    ul {{
-      padding-left: 20px;
-    }}
-    .meta {{
-      color: #4b5563;
-      font-size: 0.95rem;
-      margin: 0 0 12px;
-    }}
-    code {{
-      font-family: ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, monospace;
-      background: #f3f4f6;
-      border-radius: 6px;
-      padding: 0.1rem 0.35rem;
-      font-size: 0.92em;
-    }}
-    footer {{
-      margin-top: 16px;
-      color: #6b7280;
-      font-size: 0.9rem;
-    }}
-    @media (prefers-color-scheme: dark) {{
-      body {{
-        background: #0b1220;
-        color: #e5e7eb;
-      }}
-      article {{
-        background: #0f172a;
-        border-color: #1f2937;
-      }}
-      .meta {{
-        color: #9ca3af;
-      }}
-      code {{
-        background: #111827;
-      }}
-      footer {{
-        color: #9ca3af;
-      }}
-      a {{
-        color: #93c5fd;
-      }}
-    }}
-  </style>
-</head>
-<body>
-  <main>
-    <article>
-      <h1>Helm {html.escape(version, quote=True)} Release Notes</h1>
-      <p class="meta">Release date: {safe_date}</p>
-{body_html}
-{fallback_link}    </article>
-    <footer>Generated from <code>CHANGELOG.md</code>.</footer>
-  </main>
-</body>
-</html>
-"""
+    yield PAGE_HEAD_OPEN
+    yield f"  <title>Helm {safe_version} Release Notes</title>\n"
+    yield canonical_tag
+    yield PAGE_STYLE
+    yield PAGE_BODY_OPEN
+    yield f"      <h1>Helm {safe_version} Release Notes</h1>\n"
+    yield f'      <p class="meta">Release date: {safe_date}</p>\n'
+    yield body_html
+    yield "\n"
+    yield fallback_link
+    yield PAGE_TAIL
+
+
+def cache_key(
+    template_digest: str,
+    version: str,
+    raw_date: str,
+    section_lines: List[str],
+    canonical_url: str,
+    fallback_release_url: str,
+) -> str:
+    """Hash every input to the rendered page, including this script's own template."""
+    digest = hashlib.sha256()
+    for part in (
+        template_digest.encode("ascii"),
+        version.encode("utf-8"),
+        raw_date.encode("utf-8"),
+        "\n".join(section_lines).encode("utf-8"),
+        canonical_url.encode("utf-8"),
+        fallback_release_url.encode("utf-8"),
+    ):
+        digest.update(part)
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
 
 
-def main() -> int:
-    args = parse_args()
-    changelog_path = pathlib.Path(args.changelog_path)
-    output_path = pathlib.Path(args.output_path)
-    version = normalize_version(args.tag)
+def cache_prefix(template_digest: str) -> str:
+    return f"{template_digest[:12]}-"
 
-    if not changelog_path.is_file():
-        print(f"error: changelog not found: {changelog_path}", file=sys.stderr)
-        return 1
 
-    changelog_text = changelog_path.read_text(encoding="utf-8")
+def prune_cache(template_digest: str) -> None:
+    """Delete cached pages rendered by other versions of this script."""
+    prefix = cache_prefix(template_digest)
+    for entry in CACHE_DIR.glob("*.html"):
+        if not entry.name.startswith(prefix):
+            entry.unlink(missing_ok=True)
+
+
+def expand_tag(template: str, tag: str) -> str:
+    return template.replace("{tag}", tag)
+
+
+def prepare_cache_dir() -> bool:
+    """Create CACHE_DIR as a private directory and confirm only the current user can write it."""
+    try:
+        CACHE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+        info = CACHE_DIR.lstat()
+    except OSError:
+        return False
+    return (
+        stat.S_ISDIR(info.st_mode)
+        and info.st_uid == os.getuid()
+        and not info.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+    )
+
+
+def read_cached_page(cache_path: pathlib.Path) -> bytes | None:
+    """Return a cached page, or None when it is missing or was not fully written."""
+    try:
+        data = cache_path.read_bytes()
+    except OSError:
+        return None
+    if not data.endswith(b"</html>\n"):
+        return None
+    return data
+
+
+def store_cached_page(chunks: Iterable[str], cache_path: pathlib.Path) -> None:
+    """Write a page into the cache via a temp file so readers never see a partial entry."""
+    tmp_file = tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", dir=CACHE_DIR, suffix=".tmp", delete=False
+    )
+    tmp_path = pathlib.Path(tmp_file.name)
+    try:
+        with tmp_file:
+            tmp_file.writelines(chunks)
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def generate_page(
+    changelog_text: str,
+    tag: str,
+    output_path: pathlib.Path,
+    canonical_url: str,
+    fallback_release_url: str,
+    template_digest: str,
+    cache_usable: bool,
+) -> int:
+    version = normalize_version(tag)
     try:
         raw_date, section_lines = extract_section(changelog_text, version)
     except ValueError as exc:
         print(f"error: {exc}", file=sys.stderr)
         return 1
 
+    key = cache_key(
+        template_digest, version, raw_date, section_lines, canonical_url, fallback_release_url
+    )
+    cache_path = CACHE_DIR / f"{cache_prefix(template_digest)}{key}.html"
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    cached_page = read_cached_page(cache_path) if cache_usable else None
+    if cached_page is not None:
+        output_path.write_bytes(cached_page)
+        print(f"Generated release notes page (cached): {output_path}")
+        return 0
+
     body_html = render_section_body(section_lines)
     release_date = format_release_date(raw_date)
-    page = build_html(
+    render_page = functools.partial(
+        iter_html,
         version=version,
         release_date=release_date,
         body_html=body_html,
-        canonical_url=args.canonical_url.strip(),
-        fallback_release_url=args.fallback_release_url.strip(),
+        canonical_url=canonical_url,
+        fallback_release_url=fallback_release_url,
     )
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(page, encoding="utf-8")
+    if cache_usable:
+        try:
+            store_cached_page(render_page(), cache_path)
+        except OSError as exc:
+            print(f"warning: could not cache release notes page: {exc}", file=sys.stderr)
+        else:
+            with cache_path.open("rb") as cache_file, output_path.open("wb") as output_file:
+                shutil.copyfileobj(cache_file, output_file)
+            print(f"Generated release notes page: {output_path}")
+            return 0
+
+    with output_path.open("w", encoding="utf-8") as output_file:
+        output_file.writelines(render_page())
     print(f"Generated release notes page: {output_path}")
     return 0
 
 
+def main() -> int:
+    args = parse_args()
+    changelog_path = pathlib.Path(args.changelog_path)
+
+    if len(args.tags) > 1 and "{tag}" not in args.output_path:
+        print("error: --output-path must contain {tag} when several tags are given", file=sys.stderr)
+        return 1
+
+    if not changelog_path.is_file():
+        print(f"error: changelog not found: {changelog_path}", file=sys.stderr)
+        return 1
+
+    if args.clean_cache:
+        shutil.rmtree(CACHE_DIR, ignore_errors=True)
+
+    # Read the changelog once and render each tag in this process; a page
+    # renders in well under a millisecond, so worker start-up would dominate.
+    changelog_text = changelog_path.read_bytes().decode("utf-8")
+    template_digest = hashlib.sha256(pathlib.Path(__file__).read_bytes()).hexdigest()
+    cache_usable = prepare_cache_dir()
+    if cache_usable:
+        try:
+            prune_cache(template_digest)
+        except OSError as exc:
+            print(f"warning: could not prune release notes cache: {exc}", file=sys.stderr)
+    else:
+        print(
+            f"warning: not caching release notes pages: {CACHE_DIR} is not a private directory",
+            file=sys.stderr,
+        )
+
+    status = 0
+    for tag in args.tags:
+        status |= generate_page(
+            changelog_text,
+            tag,
+            output_path=pathlib.Path(expand_tag(args.output_path, tag)),
+            canonical_url=expand_tag(args.canonical_url.strip(), tag),
+            fallback_release_url=expand_tag(args.fallback_release_url.strip(), tag),
+            template_digest=template_digest,
+            cache_usable=cache_usable,
+        )
+    return status
+
+
 if __name__ == "__main__":
     raise SystemExit(main())